@@ -30,7 +30,6 @@ from app.schemas.pagination import DefaultLimitOffsetPage
 from app.schemas.view_models import BoardGroupSnapshot
 from app.services.board_group_snapshot import build_group_snapshot
 from app.services.openclaw.constants import DEFAULT_HEARTBEAT_CONFIG
-from app.services.openclaw.gateway_rpc import OpenClawGatewayError
 from app.services.openclaw.provisioning import OpenClawGatewayProvisioner
 from app.services.organizations import (
     OrganizationContext,
@@ -260,17 +259,18 @@ async def _sync_gateway_heartbeats(
     gateway_ids = list(agents_by_gateway_id.keys())
     gateways = await Gateway.objects.by_ids(gateway_ids).all(session)
     gateway_by_id = {gateway.id: gateway for gateway in gateways}
+    agents_by_gateway: list[tuple[Gateway, list[Agent]]] = []
     for gateway_id, gateway_agents in agents_by_gateway_id.items():
         gateway = gateway_by_id.get(gateway_id)
         if gateway is None or not gateway.url or not gateway.workspace_root:
             failed_agent_ids.extend([agent.id for agent in gateway_agents])
             continue
-        try:
-            await OpenClawGatewayProvisioner().sync_gateway_agent_heartbeats(
-                gateway,
-                gateway_agents,
-            )
-        except OpenClawGatewayError:
+        agents_by_gateway.append((gateway, gateway_agents))
+
+    # Each gateway gets its own config patch; send them concurrently instead of one by one.
+    results = await OpenClawGatewayProvisioner().sync_gateways_agent_heartbeats(agents_by_gateway)
+    for (_gateway, gateway_agents), error in zip(agents_by_gateway, results, strict=True):
+        if error is not None:
             failed_agent_ids.extend([agent.id for agent in gateway_agents])
     return failed_agent_ids
 
@@ -37,6 +37,7 @@ from app.core.logging import configure_logging, get_logger
 from app.core.security_headers import SecurityHeadersMiddleware
 from app.db.session import init_db
 from app.schemas.health import HealthStatusResponse
+from app.services.openclaw.provisioning import precompile_templates
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
@@ -437,6 +438,7 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
         settings.db_auto_migrate,
     )
     await init_db()
+    logger.info("app.lifecycle.templates_compiled count=%s", precompile_templates())
     logger.info("app.lifecycle.started")
     try:
         yield
@@ -30,7 +30,7 @@ from app.models.tasks import Task
 from app.schemas.common import OkResponse
 from app.services.openclaw.gateway_resolver import gateway_client_config, require_gateway_for_board
 from app.services.openclaw.gateway_rpc import OpenClawGatewayError
-from app.services.openclaw.provisioning import OpenClawGatewayProvisioner
+from app.services.openclaw.provisioning import OpenClawGatewayProvisioner, is_missing_agent_error
 
 if TYPE_CHECKING:
     from sqlmodel.ext.asyncio.session import AsyncSession
@@ -38,17 +38,6 @@ if TYPE_CHECKING:
     from app.models.boards import Board
 
 
-def _is_missing_gateway_agent_error(exc: OpenClawGatewayError) -> bool:
-    message = str(exc).lower()
-    if not message:
-        return False
-    if any(
-        marker in message for marker in ("unknown agent", "no such agent", "agent does not exist")
-    ):
-        return True
-    return "agent" in message and "not found" in message
-
-
 async def delete_board(session: AsyncSession, *, board: Board) -> OkResponse:
     """Delete a board and all dependent records, cleaning gateway state when configured."""
     agents = await Agent.objects.filter_by(board_id=board.id).all(session)
@@ -58,19 +47,19 @@ async def delete_board(session: AsyncSession, *, board: Board) -> OkResponse:
         gateway = await require_gateway_for_board(session, board, require_workspace_root=True)
         # Ensure URL is present (required for gateway cleanup calls).
         gateway_client_config(gateway)
-        for agent in agents:
-            try:
-                await OpenClawGatewayProvisioner().delete_agent_lifecycle(
-                    agent=agent,
-                    gateway=gateway,
-                )
-            except OpenClawGatewayError as exc:
-                if _is_missing_gateway_agent_error(exc):
-                    continue
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Gateway cleanup failed: {exc}",
-                ) from exc
+        results = await OpenClawGatewayProvisioner().delete_agents_lifecycle(
+            agents=agents,
+            gateway=gateway,
+        )
+        for result in results:
+            if not isinstance(result, OpenClawGatewayError):
+                continue
+            if is_missing_agent_error(result):
+                continue
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Gateway cleanup failed: {result}",
+            ) from result
 
     if task_ids:
         await crud.delete_where(
@@ -83,6 +83,10 @@ LEAD_GATEWAY_FILES = frozenset(
     },
 )
 
+# Sorted views of the workspace file sets, so render/write order is stable without a per-call sort.
+DEFAULT_GATEWAY_FILES_ORDERED: tuple[str, ...] = tuple(sorted(DEFAULT_GATEWAY_FILES))
+LEAD_GATEWAY_FILES_ORDERED: tuple[str, ...] = tuple(sorted(LEAD_GATEWAY_FILES))
+
 # These files are intended to evolve within the agent workspace.
 # Provision them if missing, but avoid overwriting existing content during updates.
 #
@@ -10,9 +10,11 @@ from __future__ import annotations
 import asyncio
 import json
 import ssl
+from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 from time import perf_counter, time
-from typing import Any, Literal
+from typing import Any, Literal, TypeVar
 from urllib.parse import urlencode, urlparse, urlunparse
 from uuid import uuid4
 
@@ -29,6 +31,8 @@ from app.services.openclaw.device_identity import (
 
 PROTOCOL_VERSION = 3
 logger = get_logger(__name__)
+_T = TypeVar("_T")
+
 GATEWAY_OPERATOR_SCOPES = (
     "operator.read",
     "operator.admin",
@@ -189,6 +193,12 @@ def _build_gateway_url(config: GatewayConfig) -> str:
     return str(urlunparse(parsed._replace(query=query)))
 
 
+def _encode_frame(message: dict[str, Any]) -> str:
+    # Compact separators and raw UTF-8 keep large payloads (template files, config patches)
+    # smaller on the wire and cheaper to encode than the stdlib defaults.
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
 def _redacted_url_for_log(raw_url: str) -> str:
     parsed = urlparse(raw_url)
     return str(urlunparse(parsed._replace(query="", fragment="")))
@@ -206,6 +216,13 @@ def _create_ssl_context(config: GatewayConfig) -> ssl.SSLContext | None:
         return None
     if not config.allow_insecure_tls:
         return None
+    return _insecure_ssl_context()
+
+
+@lru_cache(maxsize=1)
+def _insecure_ssl_context() -> ssl.SSLContext:
+    # Every gateway RPC opens its own websocket; share one context across them rather than
+    # rebuilding (and re-initialising OpenSSL state) on each call.
     ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
     ssl_context.check_hostname = False
     ssl_context.verify_mode = ssl.CERT_NONE
@@ -313,7 +330,7 @@ async def _send_request(
         request_id,
         sorted((params or {}).keys()),
     )
-    await ws.send(json.dumps(message))
+    await ws.send(_encode_frame(message))
     return await _await_response(ws, request_id)
 
 
@@ -381,7 +398,7 @@ async def _ensure_connected(
         "method": "connect",
         "params": _build_connect_params(config, connect_nonce=connect_nonce),
     }
-    await ws.send(json.dumps(response))
+    await ws.send(_encode_frame(response))
     return await _await_response(ws, connect_id)
 
 
@@ -394,13 +411,7 @@ async def _recv_first_message_or_none(
         return None
 
 
-async def _openclaw_call_once(
-    method: str,
-    params: dict[str, Any] | None,
-    *,
-    config: GatewayConfig,
-    gateway_url: str,
-) -> object:
+def _connect_kwargs(config: GatewayConfig, gateway_url: str) -> dict[str, Any]:
     origin = _build_control_ui_origin(gateway_url) if config.disable_device_pairing else None
     ssl_context = _create_ssl_context(config)
     connect_kwargs: dict[str, Any] = {"ping_interval": None}
@@ -408,65 +419,83 @@ async def _openclaw_call_once(
         connect_kwargs["origin"] = origin
     if ssl_context is not None:
         connect_kwargs["ssl"] = ssl_context
-    async with websockets.connect(gateway_url, **connect_kwargs) as ws:
+    return connect_kwargs
+
+
+async def _openclaw_call_once(
+    method: str,
+    params: dict[str, Any] | None,
+    *,
+    config: GatewayConfig,
+    gateway_url: str,
+) -> object:
+    async with websockets.connect(gateway_url, **_connect_kwargs(config, gateway_url)) as ws:
         first_message = await _recv_first_message_or_none(ws)
         await _ensure_connected(ws, first_message, config)
         return await _send_request(ws, method, params)
 
 
+async def _openclaw_calls_once(
+    calls: Sequence[tuple[str, dict[str, Any] | None]],
+    *,
+    config: GatewayConfig,
+    gateway_url: str,
+) -> list[object]:
+    async with websockets.connect(gateway_url, **_connect_kwargs(config, gateway_url)) as ws:
+        first_message = await _recv_first_message_or_none(ws)
+        await _ensure_connected(ws, first_message, config)
+        return [await _send_request(ws, method, params) for method, params in calls]
+
+
 async def _openclaw_connect_metadata_once(
     *,
     config: GatewayConfig,
     gateway_url: str,
 ) -> object:
-    origin = _build_control_ui_origin(gateway_url) if config.disable_device_pairing else None
-    ssl_context = _create_ssl_context(config)
-    connect_kwargs: dict[str, Any] = {"ping_interval": None}
-    if origin is not None:
-        connect_kwargs["origin"] = origin
-    if ssl_context is not None:
-        connect_kwargs["ssl"] = ssl_context
-    async with websockets.connect(gateway_url, **connect_kwargs) as ws:
+    async with websockets.connect(gateway_url, **_connect_kwargs(config, gateway_url)) as ws:
         first_message = await _recv_first_message_or_none(ws)
         return await _ensure_connected(ws, first_message, config)
 
 
-async def openclaw_call(
-    method: str,
-    params: dict[str, Any] | None = None,
+async def _logged_gateway_rpc(
+    label: str,
+    detail: str,
     *,
     config: GatewayConfig,
-) -> object:
-    """Call a gateway RPC method and return the result payload."""
-    gateway_url = _build_gateway_url(config)
+    gateway_url: str,
+    run: Callable[[], Awaitable[_T]],
+) -> _T:
+    """Await one gateway exchange with uniform logging and transport-error translation.
+
+    `label` names the log events (`gateway.rpc.<label>.*`) and `detail` (e.g. `method=status`)
+    identifies the exchange in each of them.
+    """
     started_at = perf_counter()
     logger.debug(
         (
-            "gateway.rpc.call.start method=%s gateway_url=%s allow_insecure_tls=%s "
+            "gateway.rpc.%s.start %s gateway_url=%s allow_insecure_tls=%s "
             "disable_device_pairing=%s"
         ),
-        method,
+        label,
+        detail,
         _redacted_url_for_log(gateway_url),
         config.allow_insecure_tls,
         config.disable_device_pairing,
     )
     try:
-        payload = await _openclaw_call_once(
-            method,
-            params,
-            config=config,
-            gateway_url=gateway_url,
-        )
+        result = await run()
         logger.debug(
-            "gateway.rpc.call.success method=%s duration_ms=%s",
-            method,
+            "gateway.rpc.%s.success %s duration_ms=%s",
+            label,
+            detail,
             int((perf_counter() - started_at) * 1000),
         )
-        return payload
+        return result
     except OpenClawGatewayError:
         logger.warning(
-            "gateway.rpc.call.gateway_error method=%s duration_ms=%s",
-            method,
+            "gateway.rpc.%s.gateway_error %s duration_ms=%s",
+            label,
+            detail,
             int((perf_counter() - started_at) * 1000),
         )
         raise
@@ -478,51 +507,78 @@ async def openclaw_call(
         WebSocketException,
     ) as exc:  # pragma: no cover - network/protocol errors
         logger.error(
-            "gateway.rpc.call.transport_error method=%s duration_ms=%s error_type=%s",
-            method,
+            "gateway.rpc.%s.transport_error %s duration_ms=%s error_type=%s",
+            label,
+            detail,
             int((perf_counter() - started_at) * 1000),
             exc.__class__.__name__,
         )
         raise OpenClawGatewayError(str(exc)) from exc
 
 
+async def openclaw_call(
+    method: str,
+    params: dict[str, Any] | None = None,
+    *,
+    config: GatewayConfig,
+) -> object:
+    """Call a gateway RPC method and return the result payload."""
+    gateway_url = _build_gateway_url(config)
+    return await _logged_gateway_rpc(
+        "call",
+        f"method={method}",
+        config=config,
+        gateway_url=gateway_url,
+        run=lambda: _openclaw_call_once(
+            method,
+            params,
+            config=config,
+            gateway_url=gateway_url,
+        ),
+    )
+
+
+async def openclaw_call_sequence(
+    calls: Sequence[tuple[str, dict[str, Any] | None]],
+    *,
+    config: GatewayConfig,
+) -> list[object]:
+    """Run dependent gateway RPC calls in order over one connection and return their payloads.
+
+    Each call still waits for the previous response, but the whole sequence pays for a single
+    websocket connect and gateway handshake. The first failing call raises and later calls are
+    not sent.
+    """
+    gateway_url = _build_gateway_url(config)
+    methods = ",".join(method for method, _params in calls)
+    return await _logged_gateway_rpc(
+        "call_sequence",
+        f"methods={methods}",
+        config=config,
+        gateway_url=gateway_url,
+        run=lambda: _openclaw_calls_once(calls, config=config, gateway_url=gateway_url),
+    )
+
+
 async def openclaw_connect_metadata(*, config: GatewayConfig) -> object:
     """Open a gateway connection and return the connect/hello payload."""
     gateway_url = _build_gateway_url(config)
-    started_at = perf_counter()
-    logger.debug(
-        "gateway.rpc.connect_metadata.start gateway_url=%s",
-        _redacted_url_for_log(gateway_url),
+    return await _logged_gateway_rpc(
+        "connect_metadata",
+        "method=connect",
+        config=config,
+        gateway_url=gateway_url,
+        run=lambda: _openclaw_connect_metadata_once(config=config, gateway_url=gateway_url),
     )
-    try:
-        metadata = await _openclaw_connect_metadata_once(
-            config=config,
-            gateway_url=gateway_url,
-        )
-        logger.debug(
-            "gateway.rpc.connect_metadata.success duration_ms=%s",
-            int((perf_counter() - started_at) * 1000),
-        )
-        return metadata
-    except OpenClawGatewayError:
-        logger.warning(
-            "gateway.rpc.connect_metadata.gateway_error duration_ms=%s",
-            int((perf_counter() - started_at) * 1000),
-        )
-        raise
-    except (
-        TimeoutError,
-        ConnectionError,
-        OSError,
-        ValueError,
-        WebSocketException,
-    ) as exc:  # pragma: no cover - network/protocol errors
-        logger.error(
-            "gateway.rpc.connect_metadata.transport_error duration_ms=%s error_type=%s",
-            int((perf_counter() - started_at) * 1000),
-            exc.__class__.__name__,
-        )
-        raise OpenClawGatewayError(str(exc)) from exc
+
+
+def _send_message_params(message: str, *, session_key: str, deliver: bool) -> dict[str, Any]:
+    return {
+        "sessionKey": session_key,
+        "message": message,
+        "deliver": deliver,
+        "idempotencyKey": str(uuid4()),
+    }
 
 
 async def send_message(
@@ -533,12 +589,7 @@ async def send_message(
     deliver: bool = False,
 ) -> object:
     """Send a chat message to a session."""
-    params: dict[str, Any] = {
-        "sessionKey": session_key,
-        "message": message,
-        "deliver": deliver,
-        "idempotencyKey": str(uuid4()),
-    }
+    params = _send_message_params(message, session_key=session_key, deliver=deliver)
     return await openclaw_call("chat.send", params, config=config)
 
 
@@ -559,6 +610,13 @@ async def delete_session(session_key: str, *, config: GatewayConfig) -> object:
     return await openclaw_call("sessions.delete", {"key": session_key}, config=config)
 
 
+def _ensure_session_params(session_key: str, *, label: str | None) -> dict[str, Any]:
+    params: dict[str, Any] = {"key": session_key}
+    if label:
+        params["label"] = label
+    return params
+
+
 async def ensure_session(
     session_key: str,
     *,
@@ -566,7 +624,27 @@ async def ensure_session(
     label: str | None = None,
 ) -> object:
     """Ensure a session exists and optionally update its label."""
-    params: dict[str, Any] = {"key": session_key}
-    if label:
-        params["label"] = label
+    params = _ensure_session_params(session_key, label=label)
     return await openclaw_call("sessions.patch", params, config=config)
+
+
+async def ensure_session_and_send_message(
+    message: str,
+    *,
+    session_key: str,
+    config: GatewayConfig,
+    label: str | None = None,
+    deliver: bool = False,
+) -> object:
+    """Ensure a session exists, then send it a chat message over the same connection.
+
+    Returns the `chat.send` payload.
+    """
+    _ensured, sent = await openclaw_call_sequence(
+        [
+            ("sessions.patch", _ensure_session_params(session_key, label=label)),
+            ("chat.send", _send_message_params(message, session_key=session_key, deliver=deliver)),
+        ],
+        config=config,
+    )
+    return sent
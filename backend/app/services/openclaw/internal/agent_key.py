@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
-import re
+import string
 from uuid import uuid4
 
 from app.models.agents import Agent
 from app.services.openclaw.constants import _SESSION_KEY_PARTS_MIN
 
+# Byte table keeping lowercase ASCII letters/digits and turning every other byte into a space.
+_SLUG_TABLE = bytes(
+    byte if chr(byte) in string.ascii_lowercase or chr(byte) in string.digits else 0x20
+    for byte in range(256)
+)
+
+
+def slug_words(value: str) -> str:
+    """Join the ``[a-z0-9]+`` runs of the lowercased value with ``-`` (empty if there are none)."""
+    # Non-ASCII characters become "?" and then separators, so this matches the regex form
+    # while staying in C-level str/bytes operations.
+    ascii_value = value.lower().encode("ascii", "replace").translate(_SLUG_TABLE)
+    return "-".join(ascii_value.decode("ascii").split())
+
 
 def slugify(value: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
-    return slug or uuid4().hex
+    return slug_words(value) or uuid4().hex
 
 
 def agent_key(agent: Agent) -> str:
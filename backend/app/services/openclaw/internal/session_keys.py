@@ -7,6 +7,7 @@ and API-facing services.
 
 from __future__ import annotations
 
+from functools import lru_cache
 from uuid import UUID
 
 from app.services.openclaw.constants import AGENT_SESSION_PREFIX
@@ -18,11 +19,15 @@ def gateway_main_session_key(gateway_id: UUID) -> str:
     return GatewayAgentIdentity.session_key_for_id(gateway_id)
 
 
+# Session keys are pure functions of immutable ids, so cache them for fleet-wide paths
+# (provision, heartbeat sync, teardown) that resolve the same keys repeatedly.
+@lru_cache(maxsize=4096)
 def board_lead_session_key(board_id: UUID) -> str:
     """Return the deterministic session key for a board lead agent."""
     return f"{AGENT_SESSION_PREFIX}:lead-{board_id}:main"
 
 
+@lru_cache(maxsize=4096)
 def board_agent_session_key(agent_id: UUID) -> str:
     """Return the deterministic session key for a non-lead, board-scoped agent."""
     return f"{AGENT_SESSION_PREFIX}:mc-{agent_id}:main"
@@ -11,11 +11,20 @@ import asyncio
 import json
 import re
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+from jinja2 import (
+    DictLoader,
+    Environment,
+    StrictUndefined,
+    Template,
+    TemplateNotFound,
+    select_autoescape,
+)
 
 from app.core.config import settings
 from app.core.logging import get_logger
@@ -27,6 +36,7 @@ from app.services.openclaw.constants import (
     BOARD_SHARED_TEMPLATE_MAP,
     DEFAULT_CHANNEL_HEARTBEAT_VISIBILITY,
     DEFAULT_GATEWAY_FILES,
+    DEFAULT_GATEWAY_FILES_ORDERED,
     DEFAULT_HEARTBEAT_CONFIG,
     DEFAULT_IDENTITY_PROFILE,
     EXTRA_IDENTITY_PROFILE_FIELDS,
@@ -34,6 +44,7 @@ from app.services.openclaw.constants import (
     HEARTBEAT_LEAD_TEMPLATE,
     IDENTITY_PROFILE_FIELDS,
     LEAD_GATEWAY_FILES,
+    LEAD_GATEWAY_FILES_ORDERED,
     LEAD_TEMPLATE_MAP,
     MAIN_TEMPLATE_MAP,
     PRESERVE_AGENT_EDITABLE_FILES,
@@ -42,11 +53,11 @@ from app.services.openclaw.gateway_rpc import GatewayConfig as GatewayClientConf
 from app.services.openclaw.gateway_rpc import (
     OpenClawGatewayError,
     ensure_session,
+    ensure_session_and_send_message,
     openclaw_call,
-    send_message,
 )
 from app.services.openclaw.internal.agent_key import agent_key as _agent_key
-from app.services.openclaw.internal.agent_key import slugify
+from app.services.openclaw.internal.agent_key import slug_words, slugify
 from app.services.openclaw.internal.session_keys import (
     board_agent_session_key,
     board_lead_session_key,
@@ -66,51 +77,76 @@ class ProvisionOptions:
     action: str = "provision"
     force_bootstrap: bool = False
     overwrite: bool = False
+    reset_session: bool = False
 
 
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+_TEMPLATES_ROOT = _REPO_ROOT / "templates"
 _ROLE_SOUL_MAX_CHARS = 24_000
-_ROLE_SOUL_WORD_RE = re.compile(r"[a-z0-9]+")
-
-
-def _is_missing_session_error(exc: OpenClawGatewayError) -> bool:
-    message = str(exc).lower()
-    if not message:
-        return False
-    return any(
-        marker in message
-        for marker in (
-            "not found",
-            "unknown session",
-            "no such session",
-            "session does not exist",
-        )
-    )
+# Upper bound on sessions.delete calls in flight during a multi-agent teardown.
+_SESSION_DELETE_CONCURRENCY = 16
+# Upper bound on gateways receiving a heartbeat config patch at the same time.
+_HEARTBEAT_SYNC_CONCURRENCY = 16
+# Upper bound on concurrent agents.files.set calls per agent; each call opens its own websocket.
+_FILE_WRITE_CONCURRENCY = 8
+# (profile field, template context key, default) for every identity value templates expect.
+_IDENTITY_CONTEXT_FIELDS: tuple[tuple[str, str, str], ...] = (
+    *(
+        (field, context_key, DEFAULT_IDENTITY_PROFILE[field])
+        for field, context_key in IDENTITY_PROFILE_FIELDS.items()
+    ),
+    *((field, context_key, "") for field, context_key in EXTRA_IDENTITY_PROFILE_FIELDS.items()),
+)
+# Files a board lead may have from earlier workspace contracts; any not desired now are removed.
+_LEAD_STALE_FILE_CANDIDATES: frozenset[str] = (
+    DEFAULT_GATEWAY_FILES
+    | LEAD_GATEWAY_FILES
+    | {
+        "USER.md",
+        "ROUTING.md",
+        "LEARNINGS.md",
+        "ROLE.md",
+        "WORKFLOW.md",
+        "STATUS.md",
+        "APIS.md",
+    }
+)
+# Editable files preserved on gateway-main updates; see GatewayMainAgentLifecycleManager.
+_MAIN_PRESERVE_FILES: frozenset[str] = PRESERVE_AGENT_EDITABLE_FILES - {"USER.md"}
+_BOARD_LEAD_TEMPLATE_MAP: dict[str, str] = {**BOARD_SHARED_TEMPLATE_MAP, **LEAD_TEMPLATE_MAP}
+# Template used for a workspace file when the manager supplies no override for it.
+_DEFAULT_TEMPLATE_REMAP: dict[str, str] = {"SOUL.md": "BOARD_SOUL.md.j2"}
+_FLAT_TEMPLATE_VAR_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
 
 
-def _is_missing_agent_error(exc: OpenClawGatewayError) -> bool:
-    message = str(exc).lower()
-    if not message:
-        return False
-    if any(
-        marker in message for marker in ("unknown agent", "no such agent", "agent does not exist")
-    ):
-        return True
-    return "agent" in message and "not found" in message
+_MISSING_SESSION_ERROR_RE = re.compile(
+    r"not found|unknown session|no such session|session does not exist",
+    re.IGNORECASE,
+)
+# Gateways phrase this as e.g. 'agent "mc-abc" not found', so "agent" and "not found" may appear
+# in either order with arbitrary text between them.
+_MISSING_AGENT_ERROR_RE = re.compile(
+    r"unknown agent|no such agent|agent does not exist|agent.*not found|not found.*agent",
+    re.IGNORECASE | re.DOTALL,
+)
 
 
-def _repo_root() -> Path:
-    return Path(__file__).resolve().parents[3]
+def _is_missing_session_error(exc: OpenClawGatewayError) -> bool:
+    return _MISSING_SESSION_ERROR_RE.search(str(exc)) is not None
 
 
-def _templates_root() -> Path:
-    return _repo_root() / "templates"
+def is_missing_agent_error(exc: OpenClawGatewayError) -> bool:
+    """Return whether a gateway error reports that the targeted agent does not exist."""
+    return _MISSING_AGENT_ERROR_RE.search(str(exc)) is not None
 
 
 def _heartbeat_config(agent: Agent) -> dict[str, Any]:
-    merged = DEFAULT_HEARTBEAT_CONFIG.copy()
-    if isinstance(agent.heartbeat_config, dict):
-        merged.update(agent.heartbeat_config)
-    return merged
+    # Always hand back a fresh dict: it is embedded in config.patch payloads, which must stay
+    # JSON-serializable, and callers must never be able to mutate the shared defaults.
+    overrides = agent.heartbeat_config
+    if not overrides or not isinstance(overrides, dict):
+        return DEFAULT_HEARTBEAT_CONFIG.copy()
+    return {**DEFAULT_HEARTBEAT_CONFIG, **overrides}
 
 
 def _tools_exec_host_patch(config_data: dict[str, Any]) -> dict[str, Any] | None:
@@ -150,39 +186,108 @@ def _channel_heartbeat_visibility_patch(config_data: dict[str, Any]) -> dict[str
     if not isinstance(heartbeat, dict):
         return {"defaults": {"heartbeat": DEFAULT_CHANNEL_HEARTBEAT_VISIBILITY.copy()}}
 
+    # Common case: every default is already configured, so return before copying anything.
+    if DEFAULT_CHANNEL_HEARTBEAT_VISIBILITY.keys() <= heartbeat.keys():
+        return None
+
     merged = dict(heartbeat)
-    changed = False
     for key, value in DEFAULT_CHANNEL_HEARTBEAT_VISIBILITY.items():
-        if key not in merged:
-            merged[key] = value
-            changed = True
+        merged.setdefault(key, value)
+    return {"defaults": {"heartbeat": merged}}
 
-    if not changed:
-        return None
 
-    return {"defaults": {"heartbeat": merged}}
+def _load_template_sources(root: Path) -> dict[str, str]:
+    """Read every template under ``root`` keyed by its loader name (posix relative path).
+
+    Templates ship inside the image, so loading them once at import removes per-render
+    filesystem access without changing which names resolve.
+    """
+    if not root.is_dir():
+        return {}
+    return {
+        path.relative_to(root).as_posix(): path.read_text(encoding="utf-8")
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+_TEMPLATE_LOADER = DictLoader(_load_template_sources(_TEMPLATES_ROOT))
 
 
+@lru_cache(maxsize=1)
 def _template_env() -> Environment:
-    """Create the Jinja environment used for gateway template rendering.
+    """Return the shared Jinja environment used for gateway template rendering.
+
+    The environment is built once so its compiled-template cache survives across provisioning
+    calls; each shipped template is parsed and compiled at most once per process.
 
     Note: we intentionally disable auto-escaping so markdown/plaintext templates render verbatim.
     """
 
     return Environment(
-        loader=FileSystemLoader(_templates_root()),
+        loader=_TEMPLATE_LOADER,
         # Render markdown verbatim (HTML escaping makes it harder for agents to read).
         autoescape=select_autoescape(default=False),
         undefined=StrictUndefined,
         keep_trailing_newline=True,
+        # Sources are loaded into memory at import, so there is nothing to re-check.
+        auto_reload=False,
     )
 
 
+def precompile_templates() -> int:
+    """Compile every shipped gateway template into the shared environment's cache.
+
+    Called at application startup so the first provisioning request after a deploy does not pay
+    the parse/compile cost. Returns the number of templates compiled.
+    """
+
+    env = _template_env()
+    names = [name for name in _TEMPLATE_LOADER.list_templates() if name.endswith(".j2")]
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def _get_template(env: Environment, template_name: str) -> Template:
+    # Let the loader report missing templates instead of checking for each name up front.
+    try:
+        return env.get_template(template_name)
+    except TemplateNotFound as exc:
+        msg = f"Missing template file: {template_name}"
+        raise FileNotFoundError(msg) from exc
+
+
+@lru_cache(maxsize=256)
+def _compile_override(source: str) -> Template:
+    # Agent overrides that need real Jinja are compiled once per distinct source; the same
+    # identity/soul text is re-rendered on every provision and heartbeat-driven update.
+    return _template_env().from_string(source)
+
+
+def _render_flat_template(source: str, context: dict[str, str]) -> str | None:
+    """Render a template made only of plain ``{{ name }}`` substitutions without Jinja.
+
+    Agent-provided IDENTITY/SOUL overrides are usually flat text, and compiling them through
+    ``env.from_string`` on every provision is far more expensive than a regex substitution.
+    Returns ``None`` whenever Jinja semantics could differ (blocks, comments, filters,
+    expressions, CRLF newlines, or unknown variables) so the caller falls back to Jinja.
+    """
+    if "{%" in source or "{#" in source or "\r" in source:
+        return None
+    names = _FLAT_TEMPLATE_VAR_RE.findall(source)
+    if source.count("{{") != len(names) or not all(name in context for name in names):
+        return None
+    if not names:
+        return source
+    return _FLAT_TEMPLATE_VAR_RE.sub(lambda match: context[match.group(1)], source)
+
+
 def _heartbeat_template_name(agent: Agent) -> str:
     return HEARTBEAT_LEAD_TEMPLATE if agent.is_board_lead else HEARTBEAT_AGENT_TEMPLATE
 
 
-def _workspace_path(agent: Agent, workspace_root: str) -> str:
+def _workspace_path(agent: Agent, workspace_root: str, *, key: str | None = None) -> str:
     """Return the absolute on-disk workspace directory for an agent.
 
     Why this exists:
@@ -192,26 +297,42 @@ def _workspace_path(agent: Agent, workspace_root: str) -> str:
 
     This path is later interpolated into template files (TOOLS.md, etc.) that agents treat as the
     source of truth for where to read/write.
+
+    Callers that already derived the agent key may pass it as ``key`` to avoid recomputing it.
     """
 
     if not workspace_root:
         msg = "gateway_workspace_root is required"
         raise ValueError(msg)
 
-    root = workspace_root.rstrip("/")
-
     # Use agent key derived from session key when possible. This prevents collisions for
     # lead agents (session key includes board id) even if multiple boards share the same
     # display name (e.g. "Lead Agent").
-    key = _agent_key(agent)
+    if key is None:
+        key = _agent_key(agent)
+    # Keys with no [a-z0-9] run fall back to a fresh random slug; that path is never cached,
+    # so every such agent still gets its own workspace.
+    return _workspace_path_for_key(workspace_root, key) or (
+        f"{workspace_root.rstrip('/')}/workspace-{slugify(key)}"
+    )
 
+
+@lru_cache(maxsize=2048)
+def _workspace_path_for_key(workspace_root: str, key: str) -> str:
+    """Return the workspace path for a key, or "" when the key slugs to nothing.
+
+    Pure function of its inputs; heartbeat syncs and provisions resolve the same agents' paths
+    repeatedly, so the slug pass is done once per (root, key).
+    """
     # Backwards-compat: gateway-main agents historically used session keys that encoded
     # "gateway-<id>" while the gateway agent id is "mc-gateway-<id>".
     # Keep the on-disk workspace path stable so existing provisioned files aren't moved.
     if key.startswith("mc-gateway-"):
         key = key.removeprefix("mc-")
 
-    return f"{root}/workspace-{slugify(key)}"
+    # Session-key-derived keys are not slugified by _agent_key, so this pass is still required.
+    slug = slug_words(key)
+    return f"{workspace_root.rstrip('/')}/workspace-{slug}" if slug else ""
 
 
 def _email_local_part(email: str) -> str:
@@ -258,20 +379,25 @@ def _user_context(user: User | None) -> dict[str, str]:
 
 
 def _normalized_identity_profile(agent: Agent) -> dict[str, str]:
-    identity_profile: dict[str, Any] = {}
-    if isinstance(agent.identity_profile, dict):
-        identity_profile = agent.identity_profile
+    identity_profile = agent.identity_profile
+    if not identity_profile or not isinstance(identity_profile, dict):
+        return {}
     normalized_identity: dict[str, str] = {}
     for key, value in identity_profile.items():
         if value is None:
             continue
-        if isinstance(value, list):
-            parts = [str(item).strip() for item in value if str(item).strip()]
-            if not parts:
-                continue
-            normalized_identity[key] = ", ".join(parts)
-            continue
-        text = str(value).strip()
+        if isinstance(value, str):
+            text = value.strip()
+        elif isinstance(value, list):
+            text = ", ".join(
+                part
+                for part in (
+                    item.strip() if isinstance(item, str) else str(item).strip() for item in value
+                )
+                if part
+            )
+        else:
+            text = str(value).strip()
         if text:
             normalized_identity[key] = text
     return normalized_identity
@@ -279,20 +405,14 @@ def _normalized_identity_profile(agent: Agent) -> dict[str, str]:
 
 def _identity_context(agent: Agent) -> dict[str, str]:
     normalized_identity = _normalized_identity_profile(agent)
-    identity_context = {
-        context_key: normalized_identity.get(field, DEFAULT_IDENTITY_PROFILE[field])
-        for field, context_key in IDENTITY_PROFILE_FIELDS.items()
-    }
-    extra_identity_context = {
-        context_key: normalized_identity.get(field, "")
-        for field, context_key in EXTRA_IDENTITY_PROFILE_FIELDS.items()
+    return {
+        context_key: normalized_identity.get(field, default)
+        for field, context_key, default in _IDENTITY_CONTEXT_FIELDS
     }
-    return {**identity_context, **extra_identity_context}
 
 
 def _role_slug(role: str) -> str:
-    tokens = _ROLE_SOUL_WORD_RE.findall(role.strip().lower())
-    return "-".join(tokens)
+    return slug_words(role)
 
 
 def _select_role_soul_ref(
@@ -304,17 +424,25 @@ def _select_role_soul_ref(
     if not role_slug:
         return None
 
-    exact_slug = next((ref for ref in refs if ref.slug.lower() == role_slug), None)
-    if exact_slug is not None:
-        return exact_slug
-
-    prefix_matches = [ref for ref in refs if ref.slug.lower().startswith(f"{role_slug}-")]
-    if prefix_matches:
-        return sorted(prefix_matches, key=lambda ref: len(ref.slug))[0]
-
-    contains_matches = [ref for ref in refs if role_slug in ref.slug.lower()]
-    if contains_matches:
-        return sorted(contains_matches, key=lambda ref: len(ref.slug))[0]
+    # One pass over the directory classifies every slug: an exact match wins immediately,
+    # otherwise the shortest prefix match beats the shortest substring match.
+    prefix = f"{role_slug}-"
+    prefix_match: souls_directory.SoulRef | None = None
+    contains_match: souls_directory.SoulRef | None = None
+    for ref in refs:
+        slug = ref.slug.lower()
+        if slug == role_slug:
+            return ref
+        if slug.startswith(prefix):
+            if prefix_match is None or len(ref.slug) < len(prefix_match.slug):
+                prefix_match = ref
+        elif role_slug in slug:
+            if contains_match is None or len(ref.slug) < len(contains_match.slug):
+                contains_match = ref
+    if prefix_match is not None:
+        return prefix_match
+    if contains_match is not None:
+        return contains_match
 
     role_tokens = [token for token in role_slug.split("-") if token]
     if len(role_tokens) < 2:
@@ -329,8 +457,7 @@ def _select_role_soul_ref(
     if not scored:
         return None
 
-    scored.sort(key=lambda item: (-item[0], len(item[1].slug)))
-    return scored[0][1]
+    return min(scored, key=lambda item: (-item[0], len(item[1].slug)))[1]
 
 
 async def _resolve_role_soul_markdown(role: str) -> tuple[str, str]:
@@ -372,9 +499,7 @@ def _build_context(
     session_key = agent.openclaw_session_id or ""
     base_url = settings.base_url
     main_session_key = GatewayAgentIdentity.session_key(gateway)
-    identity_context = _identity_context(agent)
-    user_context = _user_context(user)
-    return {
+    context = {
         "agent_name": agent.name,
         "agent_id": agent_id,
         "board_id": str(board.id),
@@ -400,9 +525,10 @@ def _build_context(
         "auth_token": auth_token,
         "main_session_key": main_session_key,
         "workspace_root": workspace_root,
-        **user_context,
-        **identity_context,
     }
+    context.update(_user_context(user))
+    context.update(_identity_context(agent))
+    return context
 
 
 def _build_main_context(
@@ -412,9 +538,7 @@ def _build_main_context(
     user: User | None,
 ) -> dict[str, str]:
     base_url = settings.base_url
-    identity_context = _identity_context(agent)
-    user_context = _user_context(user)
-    return {
+    context = {
         "agent_name": agent.name,
         "agent_id": str(agent.id),
         "is_main_agent": "true",
@@ -423,9 +547,10 @@ def _build_main_context(
         "auth_token": auth_token,
         "main_session_key": GatewayAgentIdentity.session_key(gateway),
         "workspace_root": gateway.workspace_root or "",
-        **user_context,
-        **identity_context,
     }
+    context.update(_user_context(user))
+    context.update(_identity_context(agent))
+    return context
 
 
 def _session_key(agent: Agent) -> str:
@@ -439,52 +564,121 @@ def _session_key(agent: Agent) -> str:
     return board_agent_session_key(agent.id)
 
 
-def _render_agent_files(
-    context: dict[str, str],
+def _main_session_key(agent: Agent, gateway: Gateway) -> str:
+    """Return the session key for a gateway-main agent, defaulting to the gateway identity."""
+
+    return (agent.openclaw_session_id or GatewayAgentIdentity.session_key(gateway)).strip()
+
+
+def _require_teardown_workspace_root(gateway: Gateway) -> str:
+    if not gateway.url:
+        msg = "Gateway url is required"
+        raise ValueError(msg)
+    if not gateway.workspace_root:
+        msg = "gateway_workspace_root is required"
+        raise ValueError(msg)
+    return gateway.workspace_root
+
+
+def _teardown_target(agent: Agent, gateway: Gateway, workspace_root: str) -> tuple[str, str]:
+    """Return the `(gateway agent id, workspace path)` removed when tearing an agent down."""
+    if agent.board_id is None:
+        return (
+            GatewayAgentIdentity.openclaw_agent_id(gateway),
+            _workspace_path(agent, workspace_root),
+        )
+    agent_gateway_id = _agent_key(agent)
+    return agent_gateway_id, _workspace_path(agent, workspace_root, key=agent_gateway_id)
+
+
+def _teardown_session_key(agent: Agent, gateway: Gateway) -> str:
+    return _main_session_key(agent, gateway) if agent.board_id is None else _session_key(agent)
+
+
+async def _delete_gateway_agent(
+    control_plane: GatewayControlPlane,
+    agent_gateway_id: str,
+    *,
+    delete_files: bool,
+) -> None:
+    try:
+        await control_plane.delete_agent(agent_gateway_id, delete_files=delete_files)
+    except OpenClawGatewayError as exc:
+        if not is_missing_agent_error(exc):
+            raise
+
+
+async def _delete_gateway_session(control_plane: GatewayControlPlane, session_key: str) -> None:
+    if not session_key:
+        return
+    try:
+        await control_plane.delete_agent_session(session_key)
+    except OpenClawGatewayError as exc:
+        if not _is_missing_session_error(exc):
+            raise
+
+
+@dataclass(frozen=True, slots=True)
+class _WorkspaceRenderPlan:
+    """Plain inputs for rendering an agent's workspace files, detached from the ORM agent."""
+
+    template_names: dict[str, str]
+    heartbeat_template: str
+    content_overrides: dict[str, str]
+
+
+def _workspace_render_plan(
     agent: Agent,
-    file_names: set[str],
+    template_overrides: dict[str, str] | None = None,
+) -> _WorkspaceRenderPlan:
+    template_names = (
+        {**_DEFAULT_TEMPLATE_REMAP, **template_overrides}
+        if template_overrides
+        else _DEFAULT_TEMPLATE_REMAP
+    )
+    content_overrides: dict[str, str] = {}
+    if agent.identity_template:
+        content_overrides["IDENTITY.md"] = agent.identity_template
+    if agent.soul_template:
+        content_overrides["SOUL.md"] = agent.soul_template
+    return _WorkspaceRenderPlan(
+        template_names=template_names,
+        heartbeat_template=(
+            template_names["HEARTBEAT.md"]
+            if "HEARTBEAT.md" in template_names
+            else _heartbeat_template_name(agent)
+        ),
+        content_overrides=content_overrides,
+    )
+
+
+def _render_workspace_files(
+    context: dict[str, str],
+    file_names: Iterable[str],
+    plan: _WorkspaceRenderPlan,
     *,
     include_bootstrap: bool,
-    template_overrides: dict[str, str] | None = None,
 ) -> dict[str, str]:
+    """Render workspace files from plain data only, so it is safe to run in a worker thread."""
     env = _template_env()
-    overrides: dict[str, str] = {}
-    if agent.identity_template:
-        overrides["IDENTITY.md"] = agent.identity_template
-    if agent.soul_template:
-        overrides["SOUL.md"] = agent.soul_template
+    template_names = plan.template_names
+    overrides = plan.content_overrides
 
+    # Files that render to nothing are omitted, so callers never write empty workspace files.
     rendered: dict[str, str] = {}
-    for name in sorted(file_names):
+    for name in file_names:
         if name == "BOOTSTRAP.md" and not include_bootstrap:
             continue
         if name == "HEARTBEAT.md":
-            heartbeat_template = (
-                template_overrides[name]
-                if template_overrides and name in template_overrides
-                else _heartbeat_template_name(agent)
-            )
-            heartbeat_path = _templates_root() / heartbeat_template
-            if not heartbeat_path.exists():
-                msg = f"Missing template file: {heartbeat_template}"
-                raise FileNotFoundError(msg)
-            rendered[name] = env.get_template(heartbeat_template).render(**context).strip()
-            continue
-        override = overrides.get(name)
-        if override:
-            rendered[name] = env.from_string(override).render(**context).strip()
-            continue
-        template_name = (
-            template_overrides[name] if template_overrides and name in template_overrides else name
-        )
-        if template_name == "SOUL.md":
-            # Use shared Jinja soul template as the default implementation.
-            template_name = "BOARD_SOUL.md.j2"
-        path = _templates_root() / template_name
-        if not path.exists():
-            msg = f"Missing template file: {template_name}"
-            raise FileNotFoundError(msg)
-        rendered[name] = env.get_template(template_name).render(**context).strip()
+            text = _get_template(env, plan.heartbeat_template).render(**context)
+        elif override := overrides.get(name):
+            flat = _render_flat_template(override, context)
+            text = _compile_override(override).render(**context) if flat is None else flat
+        else:
+            text = _get_template(env, template_names.get(name, name)).render(**context)
+        text = text.strip()
+        if text:
+            rendered[name] = text
     return rendered
 
 
@@ -555,6 +749,11 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
     def __init__(self, config: GatewayClientConfig) -> None:
         self._config = config
 
+    @property
+    def config(self) -> GatewayClientConfig:
+        """Connection config shared by every RPC issued through this control plane."""
+        return self._config
+
     async def health(self) -> object:
         return await openclaw_call("health", config=self._config)
 
@@ -620,7 +819,7 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
             except OpenClawGatewayError as exc:
                 should_retry = (
                     agent_just_created
-                    and _is_missing_agent_error(exc)
+                    and is_missing_agent_error(exc)
                     and _attempt < _update_retries - 1
                 )
                 if should_retry:
@@ -628,6 +827,8 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
                     _update_delay = min(_update_delay * 2, 4.0)
                     continue
                 raise
+        # These steps cannot be pipelined: create/update both rewrite the gateway config, and the
+        # heartbeat patch must read the post-update config (and its hash) to avoid clobbering it.
         await self.patch_agent_heartbeats(
             [(registration.agent_id, registration.workspace_path, registration.heartbeat)],
         )
@@ -704,7 +905,9 @@ class OpenClawGatewayControlPlane(GatewayControlPlane):
             patch["channels"] = channels_patch
         if tools_patch is not None:
             patch["tools"] = tools_patch
-        params = {"raw": json.dumps(patch)}
+        # The patch is embedded (escaped) inside the RPC frame and carries the whole agent list,
+        # so encode it compactly, matching how gateway frames themselves are encoded.
+        params = {"raw": json.dumps(patch, separators=(",", ":"), ensure_ascii=False)}
         if base_hash:
             params["baseHash"] = base_hash
         await openclaw_call("config.patch", params, config=self._config)
@@ -731,6 +934,16 @@ async def _gateway_config_agent_list(
     return cfg.get("hash"), agents_list, data
 
 
+def _heartbeat_entry(agent: Agent, workspace_root: str) -> tuple[str, str, dict[str, Any]]:
+    """Return the `(agent_id, workspace_path, heartbeat)` entry used by heartbeat patches."""
+    agent_id = _agent_key(agent)
+    return (
+        agent_id,
+        _workspace_path(agent, workspace_root, key=agent_id),
+        _heartbeat_config(agent),
+    )
+
+
 def _heartbeat_entry_map(
     entries: list[tuple[str, str, dict[str, Any]]],
 ) -> dict[str, tuple[str, dict[str, Any]]]:
@@ -743,31 +956,30 @@ def _updated_agent_list(
     raw_list: list[object],
     entry_by_id: dict[str, tuple[str, dict[str, Any]]],
 ) -> list[object]:
-    updated_ids: set[str] = set()
-    new_list: list[object] = []
+    # Index existing entries by id once so each desired entry is an O(1) overwrite-or-append.
+    position_by_id: dict[str, tuple[int, dict[str, Any]]] = {
+        raw_entry["id"]: (index, raw_entry)
+        for index, raw_entry in enumerate(raw_list)
+        if isinstance(raw_entry, dict) and isinstance(raw_entry.get("id"), str)
+    }
+    new_list = list(raw_list)
 
-    for raw_entry in raw_list:
-        if not isinstance(raw_entry, dict):
-            new_list.append(raw_entry)
+    for agent_id, (workspace_path, heartbeat) in entry_by_id.items():
+        position = position_by_id.get(agent_id)
+        if position is None:
+            new_list.append(
+                {"id": agent_id, "workspace": workspace_path, "heartbeat": heartbeat},
+            )
             continue
-        agent_id = raw_entry.get("id")
-        if not isinstance(agent_id, str) or agent_id not in entry_by_id:
-            new_list.append(raw_entry)
+        index, raw_entry = position
+        if raw_entry.get("workspace") == workspace_path and raw_entry.get("heartbeat") == heartbeat:
+            # Already in sync; keep the original entry so an idempotent sync yields an equal list
+            # and patch_agent_heartbeats can skip config.patch.
             continue
-
-        workspace_path, heartbeat = entry_by_id[agent_id]
         new_entry = dict(raw_entry)
         new_entry["workspace"] = workspace_path
         new_entry["heartbeat"] = heartbeat
-        new_list.append(new_entry)
-        updated_ids.add(agent_id)
-
-    for agent_id, (workspace_path, heartbeat) in entry_by_id.items():
-        if agent_id in updated_ids:
-            continue
-        new_list.append(
-            {"id": agent_id, "workspace": workspace_path, "heartbeat": heartbeat},
-        )
+        new_list[index] = new_entry
 
     return new_list
 
@@ -775,6 +987,8 @@ def _updated_agent_list(
 class BaseAgentLifecycleManager(ABC):
     """Base class for scalable board/main agent lifecycle managers."""
 
+    __slots__ = ("_gateway", "_control_plane")
+
     def __init__(self, gateway: Gateway, control_plane: GatewayControlPlane) -> None:
         self._gateway = gateway
         self._control_plane = control_plane
@@ -800,28 +1014,30 @@ class BaseAgentLifecycleManager(ABC):
         agent: Agent,
         context: dict[str, str],
     ) -> dict[str, str]:
+        # `context` is the fresh dict `_build_context` returned for this provision, so
+        # implementations may add keys to it in place instead of copying it.
         _ = agent
         return context
 
     def _template_overrides(self, agent: Agent) -> dict[str, str] | None:
         return None
 
-    def _file_names(self, agent: Agent) -> set[str]:
+    def _file_names(self, agent: Agent) -> tuple[str, ...]:
         _ = agent
-        return set(DEFAULT_GATEWAY_FILES)
+        return DEFAULT_GATEWAY_FILES_ORDERED
 
-    def _preserve_files(self, agent: Agent) -> set[str]:
+    def _preserve_files(self, agent: Agent) -> frozenset[str]:
         _ = agent
         """Files that are expected to evolve inside the agent workspace."""
-        return set(PRESERVE_AGENT_EDITABLE_FILES)
+        return PRESERVE_AGENT_EDITABLE_FILES
 
     def _allow_stale_file_deletion(self, agent: Agent) -> bool:
         _ = agent
         return False
 
-    def _stale_file_candidates(self, agent: Agent) -> set[str]:
+    def _stale_file_candidates(self, agent: Agent) -> frozenset[str]:
         _ = agent
-        return set()
+        return frozenset()
 
     async def _set_agent_files(
         self,
@@ -835,14 +1051,13 @@ class BaseAgentLifecycleManager(ABC):
         overwrite: bool = False,
     ) -> None:
         preserve_files = (
-            self._preserve_files(agent) if agent is not None else set(PRESERVE_AGENT_EDITABLE_FILES)
+            self._preserve_files(agent) if agent is not None else PRESERVE_AGENT_EDITABLE_FILES
         )
         target_file_names = desired_file_names or set(rendered.keys())
         unsupported_names: list[str] = []
 
+        writes: list[tuple[str, str]] = []
         for name, content in rendered.items():
-            if content == "":
-                continue
             # Preserve "editable" files only during updates. During first-time provisioning,
             # the gateway may pre-create defaults for USER/MEMORY/etc, and we still want to
             # apply Mission Control's templates.
@@ -850,17 +1065,30 @@ class BaseAgentLifecycleManager(ABC):
                 entry = existing_files.get(name)
                 if entry and not bool(entry.get("missing")):
                     continue
-            try:
-                await self._control_plane.set_agent_file(
-                    agent_id=agent_id,
-                    name=name,
-                    content=content,
-                )
-            except OpenClawGatewayError as exc:
-                if "unsupported file" in str(exc).lower():
-                    unsupported_names.append(name)
-                    continue
-                raise
+            writes.append((name, content))
+
+        # File writes are independent of each other; issue them concurrently so a
+        # provision costs one gateway round-trip instead of one per file.
+        semaphore = asyncio.Semaphore(_FILE_WRITE_CONCURRENCY)
+        set_file = self._control_plane.set_agent_file
+
+        async def _write(name: str, content: str) -> None:
+            async with semaphore:
+                await set_file(agent_id=agent_id, name=name, content=content)
+
+        results = await asyncio.gather(
+            *(_write(name, content) for name, content in writes),
+            return_exceptions=True,
+        )
+        for (name, _content), result in zip(writes, results, strict=True):
+            if not isinstance(result, BaseException):
+                continue
+            if isinstance(result, OpenClawGatewayError) and (
+                "unsupported file" in str(result).lower()
+            ):
+                unsupported_names.append(name)
+                continue
+            raise result
 
         if agent is not None and agent.is_board_lead and unsupported_names:
             unsupported_sorted = ", ".join(sorted(set(unsupported_names)))
@@ -876,9 +1104,10 @@ class BaseAgentLifecycleManager(ABC):
         stale_names = (
             set(existing_files.keys()) & self._stale_file_candidates(agent)
         ) - target_file_names
+        delete_file = self._control_plane.delete_agent_file
         for name in sorted(stale_names):
             try:
-                await self._control_plane.delete_agent_file(agent_id=agent_id, name=name)
+                await delete_file(agent_id=agent_id, name=name)
             except OpenClawGatewayError as exc:
                 message = str(exc).lower()
                 if any(
@@ -922,6 +1151,45 @@ class BaseAgentLifecycleManager(ABC):
             ),
         )
 
+        sync_files = self._sync_agent_files(
+            agent=agent,
+            agent_id=agent_id,
+            auth_token=auth_token,
+            user=user,
+            board=board,
+            options=options,
+        )
+        if not options.reset_session:
+            await sync_files
+            return
+        # The session reset only needs the agent registered; overlap its round-trip with the
+        # file sync instead of running it afterwards.
+        results = await asyncio.gather(
+            sync_files,
+            self._reset_session(session_key),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _reset_session(self, session_key: str) -> None:
+        try:
+            await self._control_plane.reset_agent_session(session_key)
+        except OpenClawGatewayError as exc:
+            if not _is_missing_session_error(exc):
+                raise
+
+    async def _sync_agent_files(
+        self,
+        *,
+        agent: Agent,
+        agent_id: str,
+        auth_token: str,
+        user: User | None,
+        board: Board | None,
+        options: ProvisionOptions,
+    ) -> None:
         context = self._build_context(
             agent=agent,
             auth_token=auth_token,
@@ -932,25 +1200,37 @@ class BaseAgentLifecycleManager(ABC):
         # Always attempt to sync Mission Control's full template set.
         # Do not introspect gateway defaults (avoids touching gateway "main" agent state).
         file_names = self._file_names(agent)
-        existing_files = await self._control_plane.list_agent_files(agent_id)
+        # The gateway file index only matters for update-time preservation/bootstrap decisions
+        # and stale-file cleanup; skip the round-trip for plain first-time provisioning.
+        existing_files: dict[str, dict[str, Any]] = {}
+        if options.action == "update" or self._allow_stale_file_deletion(agent):
+            existing_files = await self._control_plane.list_agent_files(agent_id)
         include_bootstrap = _should_include_bootstrap(
             action=options.action,
             force_bootstrap=options.force_bootstrap,
             existing_files=existing_files,
         )
-        rendered = _render_agent_files(
+        # Jinja rendering is synchronous CPU work; keep it off the event loop so concurrent
+        # requests are not stalled while a full template set renders. Everything read from the
+        # ORM agent is resolved here on the loop; the worker thread only sees plain strings.
+        plan = _workspace_render_plan(agent, self._template_overrides(agent))
+        rendered = await asyncio.to_thread(
+            _render_workspace_files,
             context,
-            agent,
             file_names,
+            plan,
             include_bootstrap=include_bootstrap,
-            template_overrides=self._template_overrides(agent),
         )
+        # Files that rendered empty are still desired; they must not be treated as stale.
+        desired_file_names = {
+            name for name in file_names if include_bootstrap or name != "BOOTSTRAP.md"
+        }
 
         await self._set_agent_files(
             agent=agent,
             agent_id=agent_id,
             rendered=rendered,
-            desired_file_names=set(rendered.keys()),
+            desired_file_names=desired_file_names,
             existing_files=existing_files,
             action=options.action,
             overwrite=options.overwrite,
@@ -960,6 +1240,8 @@ class BaseAgentLifecycleManager(ABC):
 class BoardAgentLifecycleManager(BaseAgentLifecycleManager):
     """Provisioning manager for board-scoped agents."""
 
+    __slots__ = ()
+
     def _agent_id(self, agent: Agent) -> str:
         return _agent_key(agent)
 
@@ -982,53 +1264,43 @@ class BoardAgentLifecycleManager(BaseAgentLifecycleManager):
         agent: Agent,
         context: dict[str, str],
     ) -> dict[str, str]:
-        context = dict(context)
         if agent.is_board_lead:
             context["directory_role_soul_markdown"] = ""
             context["directory_role_soul_source_url"] = ""
             return context
 
-        role = (context.get("identity_role") or "").strip()
-        markdown, source_url = await _resolve_role_soul_markdown(role)
+        raw_role = context.get("identity_role")
+        role = raw_role.strip() if raw_role else ""
+        markdown, source_url = await _resolve_role_soul_markdown(role) if role else ("", "")
         context["directory_role_soul_markdown"] = markdown
         context["directory_role_soul_source_url"] = source_url
         return context
 
     def _template_overrides(self, agent: Agent) -> dict[str, str] | None:
-        overrides = dict(BOARD_SHARED_TEMPLATE_MAP)
+        # Shared read-only maps: _workspace_render_plan only reads the overrides it is given.
         if agent.is_board_lead:
-            overrides.update(LEAD_TEMPLATE_MAP)
-        return overrides
+            return _BOARD_LEAD_TEMPLATE_MAP
+        return BOARD_SHARED_TEMPLATE_MAP
 
-    def _file_names(self, agent: Agent) -> set[str]:
+    def _file_names(self, agent: Agent) -> tuple[str, ...]:
         if agent.is_board_lead:
-            return set(LEAD_GATEWAY_FILES)
+            return LEAD_GATEWAY_FILES_ORDERED
         return super()._file_names(agent)
 
     def _allow_stale_file_deletion(self, agent: Agent) -> bool:
         return bool(agent.is_board_lead)
 
-    def _stale_file_candidates(self, agent: Agent) -> set[str]:
+    def _stale_file_candidates(self, agent: Agent) -> frozenset[str]:
         if not agent.is_board_lead:
-            return set()
-        return (
-            set(DEFAULT_GATEWAY_FILES)
-            | set(LEAD_GATEWAY_FILES)
-            | {
-                "USER.md",
-                "ROUTING.md",
-                "LEARNINGS.md",
-                "ROLE.md",
-                "WORKFLOW.md",
-                "STATUS.md",
-                "APIS.md",
-            }
-        )
+            return frozenset()
+        return _LEAD_STALE_FILE_CANDIDATES
 
 
 class GatewayMainAgentLifecycleManager(BaseAgentLifecycleManager):
     """Provisioning manager for organization gateway-main agents."""
 
+    __slots__ = ()
+
     def _agent_id(self, agent: Agent) -> str:
         return GatewayAgentIdentity.openclaw_agent_id(self._gateway)
 
@@ -1047,13 +1319,11 @@ class GatewayMainAgentLifecycleManager(BaseAgentLifecycleManager):
         _ = agent
         return MAIN_TEMPLATE_MAP
 
-    def _preserve_files(self, agent: Agent) -> set[str]:
+    def _preserve_files(self, agent: Agent) -> frozenset[str]:
         _ = agent
         # For gateway-main agents, USER.md is system-managed (derived from org/user context),
         # so keep it in sync even during updates.
-        preserved = super()._preserve_files(agent)
-        preserved.discard("USER.md")
-        return preserved
+        return _MAIN_PRESERVE_FILES
 
 
 def _control_plane_for_gateway(gateway: Gateway) -> OpenClawGatewayControlPlane:
@@ -1108,21 +1378,47 @@ def _wakeup_text(agent: Agent, *, verb: str) -> str:
 class OpenClawGatewayProvisioner:
     """Gateway-only agent lifecycle interface (create -> files -> wake)."""
 
+    __slots__ = ()
+
     async def sync_gateway_agent_heartbeats(self, gateway: Gateway, agents: list[Agent]) -> None:
         """Sync current Agent.heartbeat_config values to the gateway config."""
         if not gateway.workspace_root:
             msg = "gateway workspace_root is required"
             raise OpenClawGatewayError(msg)
-        entries: list[tuple[str, str, dict[str, Any]]] = []
-        for agent in agents:
-            agent_id = _agent_key(agent)
-            workspace_path = _workspace_path(agent, gateway.workspace_root)
-            heartbeat = _heartbeat_config(agent)
-            entries.append((agent_id, workspace_path, heartbeat))
+        workspace_root = gateway.workspace_root
+        entries = [_heartbeat_entry(agent, workspace_root) for agent in agents]
         if not entries:
             return
         await _patch_gateway_agent_heartbeats(gateway, entries=entries)
 
+    async def sync_gateways_agent_heartbeats(
+        self,
+        agents_by_gateway: Sequence[tuple[Gateway, list[Agent]]],
+        *,
+        concurrency: int = _HEARTBEAT_SYNC_CONCURRENCY,
+    ) -> list[OpenClawGatewayError | None]:
+        """Sync heartbeats on several gateways, keeping up to `concurrency` patches in flight.
+
+        Results line up with `agents_by_gateway`: `None` on success, or the gateway error for that
+        gateway so callers can mark only its agents as failed.
+        """
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _sync_one(gateway: Gateway, agents: list[Agent]) -> None:
+            async with semaphore:
+                await self.sync_gateway_agent_heartbeats(gateway, agents)
+
+        results: list[OpenClawGatewayError | None] = []
+        for result in await asyncio.gather(
+            *(_sync_one(gateway, agents) for gateway, agents in agents_by_gateway),
+            return_exceptions=True,
+        ):
+            if isinstance(result, BaseException) and not isinstance(result, OpenClawGatewayError):
+                raise result
+            results.append(result)
+        return results
+
     async def apply_agent_lifecycle(
         self,
         *,
@@ -1158,9 +1454,7 @@ class OpenClawGatewayProvisioner:
 
         # Resolve session key and agent type.
         if board is None:
-            session_key = (
-                agent.openclaw_session_id or GatewayAgentIdentity.session_key(gateway) or ""
-            ).strip()
+            session_key = _main_session_key(agent, gateway)
             if not session_key:
                 msg = "gateway main agent session_key is required"
                 raise ValueError(msg)
@@ -1181,32 +1475,23 @@ class OpenClawGatewayProvisioner:
                 action=action,
                 force_bootstrap=force_bootstrap,
                 overwrite=overwrite,
+                reset_session=reset_session,
             ),
             session_label=agent.name or "Gateway Agent",
         )
 
-        if reset_session:
-            try:
-                await control_plane.reset_agent_session(session_key)
-            except OpenClawGatewayError as exc:
-                if not _is_missing_session_error(exc):
-                    raise
-
         if not wake:
             return
 
-        client_config = GatewayClientConfig(
-            url=gateway.url,
-            token=gateway.token,
-            allow_insecure_tls=gateway.allow_insecure_tls,
-            disable_device_pairing=gateway.disable_device_pairing,
-        )
-        await ensure_session(session_key, config=client_config, label=agent.name)
+        # Wakeups are sent per agent on purpose: each targets its own session, and chat.send has
+        # no multi-message form, so there is nothing for a cross-agent batcher to coalesce. The
+        # session patch and the message do share one gateway connection.
         verb = wakeup_verb or ("provisioned" if action == "provision" else "updated")
-        await send_message(
+        await ensure_session_and_send_message(
             _wakeup_text(agent, verb=verb),
             session_key=session_key,
-            config=client_config,
+            config=control_plane.config,
+            label=agent.name,
             deliver=deliver_wakeup,
         )
 
@@ -1220,38 +1505,71 @@ class OpenClawGatewayProvisioner:
     ) -> str | None:
         """Remove agent runtime state from the gateway (agent + optional session)."""
 
-        if not gateway.url:
-            msg = "Gateway url is required"
-            raise ValueError(msg)
-        if not gateway.workspace_root:
-            msg = "gateway_workspace_root is required"
-            raise ValueError(msg)
-
-        workspace_path = _workspace_path(agent, gateway.workspace_root)
+        workspace_root = _require_teardown_workspace_root(gateway)
         control_plane = _control_plane_for_gateway(gateway)
+        agent_gateway_id, workspace_path = _teardown_target(agent, gateway, workspace_root)
+        await _delete_gateway_agent(control_plane, agent_gateway_id, delete_files=delete_files)
 
-        if agent.board_id is None:
-            agent_gateway_id = GatewayAgentIdentity.openclaw_agent_id(gateway)
-        else:
-            agent_gateway_id = _agent_key(agent)
-        try:
-            await control_plane.delete_agent(agent_gateway_id, delete_files=delete_files)
-        except OpenClawGatewayError as exc:
-            if not _is_missing_agent_error(exc):
-                raise
-
+        # The session is only removed once the agent is gone (or was already missing), so a
+        # failed teardown never leaves a live gateway agent without its session.
         if delete_session:
-            if agent.board_id is None:
-                session_key = (
-                    agent.openclaw_session_id or GatewayAgentIdentity.session_key(gateway) or ""
-                ).strip()
-            else:
-                session_key = _session_key(agent)
-            if session_key:
-                try:
-                    await control_plane.delete_agent_session(session_key)
-                except OpenClawGatewayError as exc:
-                    if not _is_missing_session_error(exc):
-                        raise
+            await _delete_gateway_session(control_plane, _teardown_session_key(agent, gateway))
 
         return workspace_path
+
+    async def delete_agents_lifecycle(
+        self,
+        *,
+        agents: Sequence[Agent],
+        gateway: Gateway,
+        delete_files: bool = True,
+        delete_session: bool = True,
+    ) -> list[str | OpenClawGatewayError | None]:
+        """Remove several agents from one gateway, collecting a result per agent.
+
+        Results line up with `agents`: the workspace path on success, or the gateway error for
+        that agent so callers can decide how to surface individual failures.
+        """
+
+        _require_teardown_workspace_root(gateway)
+
+        # Agent deletes run one at a time: agents.delete rewrites the gateway config just like
+        # agents.create/agents.update, so concurrent deletes would race each other's writes.
+        results: list[str | OpenClawGatewayError | None] = []
+        pending_sessions: list[tuple[int, str]] = []
+        for index, agent in enumerate(agents):
+            try:
+                workspace_path = await self.delete_agent_lifecycle(
+                    agent=agent,
+                    gateway=gateway,
+                    delete_files=delete_files,
+                    delete_session=False,
+                )
+            except OpenClawGatewayError as exc:
+                # Keep the session of an agent that could not be removed.
+                results.append(exc)
+                continue
+            results.append(workspace_path)
+            if delete_session:
+                pending_sessions.append((index, _teardown_session_key(agent, gateway)))
+        if not pending_sessions:
+            return results
+
+        # Sessions are not part of the gateway config, so those deletes can overlap.
+        control_plane = _control_plane_for_gateway(gateway)
+        semaphore = asyncio.Semaphore(_SESSION_DELETE_CONCURRENCY)
+
+        async def _delete_session(session_key: str) -> None:
+            async with semaphore:
+                await _delete_gateway_session(control_plane, session_key)
+
+        session_results = await asyncio.gather(
+            *(_delete_session(session_key) for _index, session_key in pending_sessions),
+            return_exceptions=True,
+        )
+        for (index, _session_key), result in zip(pending_sessions, session_results, strict=True):
+            if isinstance(result, OpenClawGatewayError):
+                results[index] = result
+            elif isinstance(result, BaseException):
+                raise result
+        return results
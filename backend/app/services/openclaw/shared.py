@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from uuid import UUID
 
 from app.models.gateways import Gateway
@@ -13,9 +14,14 @@ from app.services.openclaw.constants import (
 
 
 class GatewayAgentIdentity:
-    """Naming and identity rules for Mission Control gateway-main agents."""
+    """Naming and identity rules for Mission Control gateway-main agents.
+
+    Identities depend only on the gateway id, so the id-keyed builders are memoized for bulk
+    provisioning/sync paths that resolve them once per agent.
+    """
 
     @classmethod
+    @lru_cache(maxsize=256)
     def session_key_for_id(cls, gateway_id: UUID) -> str:
         return f"{_GATEWAY_AGENT_PREFIX}{gateway_id}{_GATEWAY_AGENT_SUFFIX}"
 
@@ -24,6 +30,7 @@ class GatewayAgentIdentity:
         return cls.session_key_for_id(gateway.id)
 
     @classmethod
+    @lru_cache(maxsize=256)
     def openclaw_agent_id_for_id(cls, gateway_id: UUID) -> str:
         return f"{_GATEWAY_OPENCLAW_AGENT_PREFIX}{gateway_id}"
 
@@ -14,6 +14,8 @@ SOULS_DIRECTORY_BASE_URL: Final[str] = "https://souls.directory"
 SOULS_DIRECTORY_SITEMAP_URL: Final[str] = f"{SOULS_DIRECTORY_BASE_URL}/sitemap.xml"
 
 _SITEMAP_TTL_SECONDS: Final[int] = 60 * 60
+_MARKDOWN_TTL_SECONDS: Final[int] = 60 * 60
+_MARKDOWN_CACHE_MAX_ENTRIES: Final[int] = 256
 _SOUL_URL_MIN_PARTS: Final[int] = 6
 _LOC_PATTERN: Final[re.Pattern[str]] = re.compile(
     r"<(?:[A-Za-z0-9_]+:)?loc>(.*?)</(?:[A-Za-z0-9_]+:)?loc>",
@@ -64,6 +66,24 @@ _sitemap_cache: dict[str, object] = {
     "loaded_at": 0.0,
     "refs": [],
 }
+# Raw markdown URL -> (loaded_at, content), oldest insert first. Provisioning fetches the same
+# role soul for every agent sharing that role, so repeat provisions reuse the cached copy.
+_markdown_cache: dict[str, tuple[float, str]] = {}
+
+
+def _store_markdown(url: str, content: str, *, now: float) -> None:
+    """Cache fetched markdown, dropping expired entries and then the oldest past the size cap."""
+    for cached_url in [
+        cached_url
+        for cached_url, (loaded_at, _content) in _markdown_cache.items()
+        if now - loaded_at >= _MARKDOWN_TTL_SECONDS
+    ]:
+        del _markdown_cache[cached_url]
+    # Re-inserting moves a refreshed entry to the end, keeping dict order oldest-first.
+    _markdown_cache.pop(url, None)
+    while len(_markdown_cache) >= _MARKDOWN_CACHE_MAX_ENTRIES:
+        del _markdown_cache[next(iter(_markdown_cache))]
+    _markdown_cache[url] = (now, content)
 
 
 async def list_souls_directory_refs(
@@ -102,13 +122,18 @@ async def fetch_soul_markdown(
     slug: str,
     client: httpx.AsyncClient | None = None,
 ) -> str:
-    """Fetch raw markdown content for a specific handle/slug pair."""
+    """Fetch raw markdown content for a specific handle/slug pair, cached for a TTL."""
     normalized_handle = handle.strip().strip("/")
     normalized_slug = slug.strip().strip("/")
     if normalized_slug.endswith(".md"):
         normalized_slug = normalized_slug[: -len(".md")]
     url = f"{SOULS_DIRECTORY_BASE_URL}/api/souls/" f"{normalized_handle}/{normalized_slug}.md"
 
+    now = time.time()
+    cached = _markdown_cache.get(url)
+    if cached is not None and now - cached[0] < _MARKDOWN_TTL_SECONDS:
+        return cached[1]
+
     owns_client = client is None
     if client is None:
         client = httpx.AsyncClient(
@@ -118,6 +143,8 @@ async def fetch_soul_markdown(
     try:
         resp = await client.get(url)
         resp.raise_for_status()
+        # Only successful fetches are cached, so a transient failure is retried on the next call.
+        _store_markdown(url, resp.text, now=now)
         return resp.text
     finally:
         if owns_client:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from types import SimpleNamespace
 from uuid import UUID, uuid4
@@ -18,6 +19,7 @@ from app.services.souls_directory import SoulRef
 def test_slugify_normalizes_and_trims():
     assert agent_provisioning.slugify("Hello, World") == "hello-world"
     assert agent_provisioning.slugify("  A   B  ") == "a-b"
+    assert agent_provisioning.slugify("Café_Ümlaut--2") == "caf-mlaut-2"
 
 
 def test_slugify_falls_back_to_uuid_hex(monkeypatch):
@@ -56,6 +58,25 @@ def test_workspace_path_preserves_tilde_in_workspace_root():
     assert agent_provisioning._workspace_path(agent, "~/.openclaw") == "~/.openclaw/workspace-alice"
 
 
+def test_workspace_path_keeps_gateway_main_naming_for_explicit_key():
+    agent = _AgentStub(name="Gateway Agent")
+    root = "/srv/openclaw/"
+
+    path = agent_provisioning._workspace_path(agent, root, key="mc-gateway-1234")
+
+    assert path == "/srv/openclaw/workspace-gateway-1234"
+    assert agent_provisioning._workspace_path(agent, root, key="mc-gateway-1234") == path
+
+
+def test_workspace_path_does_not_cache_random_slug_fallback(monkeypatch):
+    hexes = iter(["aaaa", "bbbb"])
+    monkeypatch.setattr(agent_key_mod, "uuid4", lambda: SimpleNamespace(hex=next(hexes)))
+    agent = _AgentStub(name="!!!")
+
+    assert agent_provisioning._workspace_path(agent, "/tmp", key="!!!") == "/tmp/workspace-aaaa"
+    assert agent_provisioning._workspace_path(agent, "/tmp", key="!!!") == "/tmp/workspace-bbbb"
+
+
 def test_wakeup_text_includes_bootstrap_before_agents():
     agent = _AgentStub(name="Alice")
 
@@ -72,7 +93,7 @@ def test_agent_lifecycle_workspace_path_preserves_tilde_in_workspace_root():
 
 
 def test_templates_root_points_to_repo_templates_dir():
-    root = agent_provisioning._templates_root()
+    root = agent_provisioning._TEMPLATES_ROOT
     assert root.name == "templates"
     assert root.parent.name == "backend"
     assert (root / "BOARD_AGENTS.md.j2").exists()
@@ -112,6 +133,109 @@ def test_user_context_prefers_name_token_when_preferred_name_missing():
     assert context["user_preferred_name"] == "Jane"
 
 
+def test_normalized_identity_profile_joins_lists_and_drops_blanks():
+    agent = _AgentStub(
+        name="Alice",
+        identity_profile={
+            "role": "  Researcher ",
+            "purpose": ["find things", " ", 3],
+            "emoji": None,
+            "verbosity": "   ",
+            "custom_instructions": [],
+        },
+    )
+
+    assert agent_provisioning._normalized_identity_profile(agent) == {
+        "role": "Researcher",
+        "purpose": "find things, 3",
+    }
+    assert agent_provisioning._normalized_identity_profile(_AgentStub(name="Bob")) == {}
+
+
+def test_template_env_is_shared_and_caches_compiled_templates():
+    env = agent_provisioning._template_env()
+
+    assert agent_provisioning._template_env() is env
+    assert agent_provisioning._get_template(env, "BOARD_SOUL.md.j2") is env.get_template(
+        "BOARD_SOUL.md.j2",
+    )
+
+
+def test_render_workspace_files_resolves_template_names(monkeypatch):
+    requested: list[str] = []
+
+    class _TemplateStub:
+        def __init__(self, name: str) -> None:
+            self._name = name
+
+        def render(self, **context):
+            return self._name
+
+    def _fake_get_template(env, template_name):
+        requested.append(template_name)
+        return _TemplateStub(template_name)
+
+    monkeypatch.setattr(agent_provisioning, "_get_template", _fake_get_template)
+    agent = _AgentStub(name="Alice")
+
+    rendered = agent_provisioning._render_workspace_files(
+        {},
+        ("AGENTS.md", "HEARTBEAT.md", "SOUL.md"),
+        agent_provisioning._workspace_render_plan(agent),  # type: ignore[arg-type]
+        include_bootstrap=False,
+    )
+    assert rendered == {
+        "AGENTS.md": "AGENTS.md",
+        "HEARTBEAT.md": agent_provisioning.HEARTBEAT_AGENT_TEMPLATE,
+        "SOUL.md": "BOARD_SOUL.md.j2",
+    }
+
+    requested.clear()
+    agent_provisioning._render_workspace_files(
+        {},
+        ("AGENTS.md", "SOUL.md"),
+        agent_provisioning._workspace_render_plan(
+            agent,  # type: ignore[arg-type]
+            {"AGENTS.md": "BOARD_AGENTS.md.j2"},
+        ),
+        include_bootstrap=False,
+    )
+    assert requested == ["BOARD_AGENTS.md.j2", "BOARD_SOUL.md.j2"]
+
+
+def test_precompile_templates_compiles_every_shipped_template():
+    assert agent_provisioning.precompile_templates() == len(
+        list(agent_provisioning._TEMPLATES_ROOT.glob("*.j2")),
+    )
+
+
+def test_render_flat_template_matches_jinja_or_defers_to_it():
+    env = agent_provisioning._template_env()
+    context = {"agent_name": "Alice", "identity_role": "Researcher"}
+
+    flat = "# {{ agent_name }}\nRole: {{identity_role}} }}"
+    assert agent_provisioning._render_flat_template(flat, context) == env.from_string(
+        flat,
+    ).render(**context)
+    assert agent_provisioning._render_flat_template("no markers", context) == "no markers"
+
+    for source in (
+        "{% if agent_name %}x{% endif %}",
+        "{# note #}{{ agent_name }}",
+        "{{ agent_name | upper }}",
+        "{{ missing_key }}",
+    ):
+        assert agent_provisioning._render_flat_template(source, context) is None
+
+
+def test_compile_override_reuses_compiled_template():
+    source = "{% if agent_name %}Hi {{ agent_name }}{% endif %}"
+    first = agent_provisioning._compile_override(source)
+
+    assert agent_provisioning._compile_override(source) is first
+    assert first.render(agent_name="Alice") == "Hi Alice"
+
+
 @dataclass
 class _GatewayStub:
     id: UUID
@@ -123,6 +247,80 @@ class _GatewayStub:
     disable_device_pairing: bool = False
 
 
+def _gateway_stub(name: str = "G") -> _GatewayStub:
+    return _GatewayStub(id=uuid4(), name=name, url="ws://x", token=None, workspace_root="/tmp")
+
+
+def _board_worker(name: str = "Worker") -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid4(),
+        name=name,
+        board_id=uuid4(),
+        openclaw_session_id=None,
+        is_board_lead=False,
+    )
+
+
+class _ConcurrencyProbe:
+    """Tracks how many probed calls are suspended at the same time."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def step(self, yields: int = 1) -> None:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        for _ in range(yields):
+            await asyncio.sleep(0)
+        self.in_flight -= 1
+
+
+class _ControlPlaneStub:
+    """Records lifecycle calls; tests subclass it to inject failures or probes."""
+
+    def __init__(self) -> None:
+        self.events: list[str] = []
+        self.writes: list[tuple[str, str]] = []
+        self.deleted_agents: list[str] = []
+        self.deleted_sessions: list[str] = []
+
+    async def upsert_agent(self, registration):
+        self.events.append("upsert")
+
+    async def reset_agent_session(self, session_key):
+        self.events.append(f"reset:{session_key}")
+
+    async def list_agent_files(self, agent_id):
+        return {}
+
+    async def set_agent_file(self, *, agent_id, name, content):
+        self.events.append(f"write:{name}")
+        self.writes.append((name, content))
+
+    async def delete_agent(self, agent_id, *, delete_files=True):
+        self.deleted_agents.append(agent_id)
+
+    async def delete_agent_session(self, session_key):
+        self.deleted_sessions.append(session_key)
+
+
+class _StubManager(agent_provisioning.BaseAgentLifecycleManager):
+    def _agent_id(self, agent):
+        return "agent-x"
+
+    def _build_context(self, *, agent, auth_token, user, board):
+        return {"user_timezone": "UTC"}
+
+
+class _BootstrapOnlyManager(_StubManager):
+    def _file_names(self, agent):
+        return ("BOOTSTRAP.md",)
+
+    def _template_overrides(self, agent):
+        return {"BOOTSTRAP.md": "BOARD_DELIVERY_STATUS.md.j2"}
+
+
 @pytest.mark.asyncio
 async def test_provision_main_agent_uses_dedicated_openclaw_agent_id(monkeypatch):
     gateway_id = uuid4()
@@ -148,7 +346,9 @@ async def test_provision_main_agent_uses_dedicated_openclaw_agent_id(monkeypatch
         captured["files_index_agent_id"] = agent_id
         return {}
 
-    def _fake_render_agent_files(*args, **kwargs):
+    def _fake_render_workspace_files(*args, **kwargs):
+        # Rendering runs in a worker thread, so it must never receive the ORM agent itself.
+        assert not any(isinstance(arg, _AgentStub) for arg in (*args, *kwargs.values()))
         return {}
 
     async def _fake_set_agent_files(self, **kwargs):
@@ -169,7 +369,11 @@ async def test_provision_main_agent_uses_dedicated_openclaw_agent_id(monkeypatch
         "list_agent_files",
         _fake_list_agent_files,
     )
-    monkeypatch.setattr(agent_provisioning, "_render_agent_files", _fake_render_agent_files)
+    monkeypatch.setattr(
+        agent_provisioning,
+        "_render_workspace_files",
+        _fake_render_workspace_files,
+    )
     monkeypatch.setattr(
         agent_provisioning.BaseAgentLifecycleManager,
         "_set_agent_files",
@@ -182,7 +386,7 @@ async def test_provision_main_agent_uses_dedicated_openclaw_agent_id(monkeypatch
         board=None,
         auth_token="secret-token",
         user=None,
-        action="provision",
+        action="update",
         wake=False,
     )
 
@@ -191,6 +395,48 @@ async def test_provision_main_agent_uses_dedicated_openclaw_agent_id(monkeypatch
     assert captured["files_index_agent_id"] == expected_agent_id
 
 
+@pytest.mark.asyncio
+async def test_provision_skips_file_index_for_first_time_worker_provision():
+    class _NoIndexControlPlane(_ControlPlaneStub):
+        async def list_agent_files(self, agent_id):
+            raise AssertionError("list_agent_files should not be called")
+
+    cp = _NoIndexControlPlane()
+    mgr = _BootstrapOnlyManager(_gateway_stub(), cp)  # type: ignore[arg-type]
+
+    await mgr.provision(
+        agent=_AgentStub(name="Worker"),  # type: ignore[arg-type]
+        session_key="agent:mc-x:main",
+        auth_token="token",
+        user=None,
+        options=agent_provisioning.ProvisionOptions(action="provision"),
+    )
+
+    assert [name for name, _content in cp.writes] == ["BOOTSTRAP.md"]
+
+
+@pytest.mark.asyncio
+async def test_provision_resets_session_alongside_file_sync():
+    class _MissingSessionControlPlane(_ControlPlaneStub):
+        async def reset_agent_session(self, session_key):
+            await super().reset_agent_session(session_key)
+            raise agent_provisioning.OpenClawGatewayError("unknown session")
+
+    cp = _MissingSessionControlPlane()
+    mgr = _BootstrapOnlyManager(_gateway_stub(), cp)  # type: ignore[arg-type]
+
+    await mgr.provision(
+        agent=_AgentStub(name="Worker"),  # type: ignore[arg-type]
+        session_key="agent:mc-x:main",
+        auth_token="token",
+        user=None,
+        options=agent_provisioning.ProvisionOptions(action="provision", reset_session=True),
+    )
+
+    assert cp.events[0] == "upsert"
+    assert sorted(cp.events[1:]) == ["reset:agent:mc-x:main", "write:BOOTSTRAP.md"]
+
+
 @pytest.mark.asyncio
 async def test_provision_overwrites_user_md_on_first_provision(monkeypatch):
     """Gateway may pre-create USER.md; we still want MC's template on first provision."""
@@ -462,6 +708,53 @@ async def test_set_agent_files_update_overwrite_writes_preserved_user_md():
     assert ("USER.md", "filled") in cp.writes
 
 
+@pytest.mark.asyncio
+async def test_set_agent_files_writes_all_files_and_collects_unsupported():
+    class _NoBootstrapControlPlane(_ControlPlaneStub):
+        async def set_agent_file(self, *, agent_id, name, content):
+            if name == "BOOTSTRAP.md":
+                raise agent_provisioning.OpenClawGatewayError("unsupported file: BOOTSTRAP.md")
+            await super().set_agent_file(agent_id=agent_id, name=name, content=content)
+
+    cp = _NoBootstrapControlPlane()
+    mgr = _StubManager(_gateway_stub(), cp)  # type: ignore[arg-type]
+    lead = _AgentStub(name="Lead", is_board_lead=True)
+
+    with pytest.raises(RuntimeError, match="BOOTSTRAP.md"):
+        await mgr._set_agent_files(
+            agent=lead,  # type: ignore[arg-type]
+            agent_id="agent-x",
+            rendered={"AGENTS.md": "a", "BOOTSTRAP.md": "b", "TOOLS.md": "t"},
+            existing_files={},
+            action="provision",
+        )
+    assert sorted(cp.writes) == [("AGENTS.md", "a"), ("TOOLS.md", "t")]
+
+
+@pytest.mark.asyncio
+async def test_set_agent_files_caps_concurrent_writes(monkeypatch):
+    monkeypatch.setattr(agent_provisioning, "_FILE_WRITE_CONCURRENCY", 2)
+    probe = _ConcurrencyProbe()
+
+    class _ProbedControlPlane(_ControlPlaneStub):
+        async def set_agent_file(self, *, agent_id, name, content):
+            await probe.step()
+            await super().set_agent_file(agent_id=agent_id, name=name, content=content)
+
+    cp = _ProbedControlPlane()
+    mgr = _StubManager(_gateway_stub(), cp)  # type: ignore[arg-type]
+
+    rendered = {f"FILE{index}.md": "x" for index in range(6)}
+    await mgr._set_agent_files(
+        agent_id="agent-x",
+        rendered=rendered,
+        existing_files={},
+        action="provision",
+    )
+    assert sorted(name for name, _content in cp.writes) == sorted(rendered)
+    assert probe.peak == 2
+
+
 @pytest.mark.asyncio
 async def test_control_plane_upsert_agent_create_then_update(monkeypatch):
     calls: list[tuple[str, dict[str, object] | None]] = []
@@ -613,15 +906,68 @@ async def test_control_plane_upsert_agent_missing_after_already_exists_fails_fas
     assert sleeps == []
 
 
+def test_updated_agent_list_overwrites_in_place_and_appends_new_entries():
+    heartbeat = {"every": "5m"}
+    raw_list = [
+        "not-a-dict",
+        {"id": "a", "workspace": "/old", "heartbeat": {}, "model": "x"},
+        {"id": "b", "workspace": "/b", "heartbeat": {}},
+    ]
+
+    new_list = agent_provisioning._updated_agent_list(
+        raw_list,
+        {"c": ("/c", heartbeat), "a": ("/a", heartbeat)},
+    )
+
+    assert new_list == [
+        "not-a-dict",
+        {"id": "a", "workspace": "/a", "heartbeat": heartbeat, "model": "x"},
+        {"id": "b", "workspace": "/b", "heartbeat": {}},
+        {"id": "c", "workspace": "/c", "heartbeat": heartbeat},
+    ]
+    assert raw_list[1]["workspace"] == "/old"
+
+
+def test_updated_agent_list_reuses_entries_that_are_already_in_sync():
+    heartbeat = {"every": "5m"}
+    entry = {"id": "a", "workspace": "/a", "heartbeat": {"every": "5m"}}
+    raw_list = [entry]
+
+    new_list = agent_provisioning._updated_agent_list(raw_list, {"a": ("/a", heartbeat)})
+
+    assert new_list == raw_list
+    assert new_list[0] is entry
+
+
 def test_is_missing_agent_error_matches_gateway_agent_not_found() -> None:
-    assert agent_provisioning._is_missing_agent_error(
+    assert agent_provisioning.is_missing_agent_error(
         agent_provisioning.OpenClawGatewayError('agent "mc-abc" not found'),
     )
-    assert not agent_provisioning._is_missing_agent_error(
+    assert not agent_provisioning.is_missing_agent_error(
         agent_provisioning.OpenClawGatewayError("dial tcp: connection refused"),
     )
 
 
+def test_is_missing_session_error_matches_known_markers() -> None:
+    assert agent_provisioning._is_missing_session_error(
+        agent_provisioning.OpenClawGatewayError("Unknown session: agent:mc-abc:main"),
+    )
+    assert not agent_provisioning._is_missing_session_error(
+        agent_provisioning.OpenClawGatewayError(""),
+    )
+    assert not agent_provisioning._is_missing_session_error(
+        agent_provisioning.OpenClawGatewayError("gateway timeout"),
+    )
+
+
+def test_role_slug_keeps_lowercase_ascii_alnum_runs() -> None:
+    assert agent_provisioning._role_slug("  Senior  Data-Scientist (ML) ") == (
+        "senior-data-scientist-ml"
+    )
+    assert agent_provisioning._role_slug("Rolé 2") == "rol-2"
+    assert agent_provisioning._role_slug("  ") == ""
+
+
 def test_select_role_soul_ref_prefers_exact_slug() -> None:
     refs = [
         SoulRef(handle="team", slug="security"),
@@ -635,6 +981,19 @@ def test_select_role_soul_ref_prefers_exact_slug() -> None:
     assert selected.slug == "security-auditor"
 
 
+def test_select_role_soul_ref_prefers_shortest_prefix_over_contains() -> None:
+    refs = [
+        SoulRef(handle="team", slug="lead-security-auditor"),
+        SoulRef(handle="team", slug="security-auditor-senior"),
+        SoulRef(handle="team", slug="security-auditor-pro"),
+    ]
+
+    selected = agent_provisioning._select_role_soul_ref(refs, role="Security Auditor")
+
+    assert selected is not None
+    assert selected.slug == "security-auditor-pro"
+
+
 @pytest.mark.asyncio
 async def test_resolve_role_soul_markdown_returns_best_effort(
     monkeypatch: pytest.MonkeyPatch,
@@ -764,3 +1123,95 @@ async def test_delete_agent_lifecycle_raises_on_non_missing_agent_error(monkeypa
             delete_files=True,
             delete_session=True,
         )
+
+
+@pytest.mark.asyncio
+async def test_delete_agents_lifecycle_returns_per_agent_errors_in_order(monkeypatch) -> None:
+    probe = _ConcurrencyProbe()
+
+    class _FlakyControlPlane(_ControlPlaneStub):
+        async def delete_agent(self, agent_id, *, delete_files=True):
+            await probe.step()
+            await super().delete_agent(agent_id, delete_files=delete_files)
+            if len(self.deleted_agents) == 2:
+                raise agent_provisioning.OpenClawGatewayError("gateway timeout")
+
+    agents = [_board_worker(f"Worker {index}") for index in range(3)]
+    control_plane = _FlakyControlPlane()
+    monkeypatch.setattr(agent_provisioning, "_control_plane_for_gateway", lambda _g: control_plane)
+
+    results = await agent_provisioning.OpenClawGatewayProvisioner().delete_agents_lifecycle(
+        agents=agents,  # type: ignore[arg-type]
+        gateway=_gateway_stub(),  # type: ignore[arg-type]
+    )
+
+    assert control_plane.deleted_agents == [f"worker-{index}" for index in range(3)]
+    assert probe.peak == 1
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], agent_provisioning.OpenClawGatewayError)
+    assert isinstance(results[2], str)
+
+
+@pytest.mark.asyncio
+async def test_delete_agents_lifecycle_never_overlaps_agent_deletes(monkeypatch) -> None:
+    agent_probe = _ConcurrencyProbe()
+    session_probe = _ConcurrencyProbe()
+
+    class _ProbedControlPlane(_ControlPlaneStub):
+        async def delete_agent(self, agent_id, *, delete_files=True):
+            await agent_probe.step(yields=2)
+            if agent_id == "worker-1":
+                raise agent_provisioning.OpenClawGatewayError("gateway timeout")
+            await super().delete_agent(agent_id, delete_files=delete_files)
+
+        async def delete_agent_session(self, session_key):
+            # Session deletes start only after every agent delete has settled.
+            assert agent_probe.in_flight == 0
+            await session_probe.step()
+            await super().delete_agent_session(session_key)
+
+    agents = [_board_worker(f"Worker {index}") for index in range(4)]
+    control_plane = _ProbedControlPlane()
+    monkeypatch.setattr(agent_provisioning, "_control_plane_for_gateway", lambda _g: control_plane)
+
+    results = await agent_provisioning.OpenClawGatewayProvisioner().delete_agents_lifecycle(
+        agents=agents,  # type: ignore[arg-type]
+        gateway=_gateway_stub(),  # type: ignore[arg-type]
+    )
+
+    assert agent_probe.peak == 1
+    assert session_probe.peak > 1
+    assert isinstance(results[1], agent_provisioning.OpenClawGatewayError)
+    # The agent that could not be removed keeps its session.
+    assert sorted(control_plane.deleted_sessions) == sorted(
+        agent_provisioning._session_key(agent)  # type: ignore[arg-type]
+        for index, agent in enumerate(agents)
+        if index != 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_gateways_agent_heartbeats_returns_per_gateway_errors(monkeypatch) -> None:
+    patched: list[str] = []
+    probe = _ConcurrencyProbe()
+
+    async def _fake_patch(gateway, *, entries) -> None:
+        await probe.step()
+        patched.append(gateway.name)
+        if gateway.name == "G1":
+            raise agent_provisioning.OpenClawGatewayError("gateway timeout")
+
+    monkeypatch.setattr(agent_provisioning, "_patch_gateway_agent_heartbeats", _fake_patch)
+    gateways = [_gateway_stub(f"G{index}") for index in range(3)]
+    agent = _AgentStub(name="Worker", openclaw_session_id="agent:worker:main")
+
+    results = await agent_provisioning.OpenClawGatewayProvisioner().sync_gateways_agent_heartbeats(
+        [(gateway, [agent]) for gateway in gateways],  # type: ignore[misc]
+        concurrency=2,
+    )
+
+    assert sorted(patched) == ["G0", "G1", "G2"]
+    assert probe.peak == 2
+    assert results[0] is None
+    assert isinstance(results[1], agent_provisioning.OpenClawGatewayError)
+    assert results[2] is None
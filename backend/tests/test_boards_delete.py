@@ -11,6 +11,7 @@ from uuid import uuid4
 import pytest
 
 import app.services.board_lifecycle as board_lifecycle
+import app.services.openclaw.provisioning as agent_provisioning
 from app.api import boards
 from app.models.boards import Board
 from app.services.openclaw.gateway_rpc import OpenClawGatewayError
@@ -135,6 +136,9 @@ async def test_delete_board_ignores_missing_gateway_agent(monkeypatch: pytest.Mo
         called["delete_agent_lifecycle"] += 1
         raise OpenClawGatewayError('agent "mc-worker" not found')
 
+    def _unexpected_control_plane(_gateway: object) -> object:
+        raise AssertionError("no session delete expected for an agent that was not removed")
+
     monkeypatch.setattr(
         board_lifecycle.Agent,
         "objects",
@@ -151,6 +155,11 @@ async def test_delete_board_ignores_missing_gateway_agent(monkeypatch: pytest.Mo
         "delete_agent_lifecycle",
         _fake_delete_agent_lifecycle,
     )
+    monkeypatch.setattr(
+        agent_provisioning,
+        "_control_plane_for_gateway",
+        _unexpected_control_plane,
+    )
 
     await boards.delete_board(
         session=session,
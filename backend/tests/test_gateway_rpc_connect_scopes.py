@@ -282,3 +282,50 @@ async def test_openclaw_call_once_passes_ssl_context_for_insecure_wss(
     kwargs = captured["kwargs"]
     assert isinstance(kwargs, dict)
     assert kwargs.get("ssl") is not None
+
+
+@pytest.mark.asyncio
+async def test_ensure_session_and_send_message_share_one_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    connect_count = 0
+    sent: list[tuple[str, object]] = []
+
+    def _fake_connect(_url: str, **_kwargs: object) -> _FakeConnectContext:
+        nonlocal connect_count
+        connect_count += 1
+        return _FakeConnectContext()
+
+    async def _fake_recv_first(_ws: object) -> None:
+        return None
+
+    async def _fake_ensure_connected(
+        _ws: object, _first_message: object, _config: GatewayConfig
+    ) -> None:
+        return None
+
+    async def _fake_send_request(_ws: object, method: str, params: object) -> object:
+        sent.append((method, params))
+        return {"method": method}
+
+    monkeypatch.setattr(gateway_rpc.websockets, "connect", _fake_connect)
+    monkeypatch.setattr(gateway_rpc, "_recv_first_message_or_none", _fake_recv_first)
+    monkeypatch.setattr(gateway_rpc, "_ensure_connected", _fake_ensure_connected)
+    monkeypatch.setattr(gateway_rpc, "_send_request", _fake_send_request)
+
+    payload = await gateway_rpc.ensure_session_and_send_message(
+        "hello",
+        session_key="agent:a:main",
+        config=GatewayConfig(url="ws://gateway.example/ws"),
+        label="Agent A",
+    )
+
+    assert payload == {"method": "chat.send"}
+    assert connect_count == 1
+    assert [method for method, _params in sent] == ["sessions.patch", "chat.send"]
+    assert sent[0][1] == {"key": "agent:a:main", "label": "Agent A"}
+    chat_params = sent[1][1]
+    assert isinstance(chat_params, dict)
+    assert chat_params["sessionKey"] == "agent:a:main"
+    assert chat_params["message"] == "hello"
+    assert chat_params["deliver"] is False
@@ -52,3 +52,16 @@ def test_create_ssl_context_respects_ip_address_with_insecure_flag() -> None:
     assert ssl_context is not None
     assert ssl_context.check_hostname is False
     assert ssl_context.verify_mode == ssl.CERT_NONE
+
+
+def test_create_ssl_context_reuses_insecure_context_across_calls() -> None:
+    """Insecure TLS contexts are shared rather than rebuilt for every connection."""
+    first = _create_ssl_context(
+        GatewayConfig(url="wss://gateway.example:18789/ws", allow_insecure_tls=True),
+    )
+    second = _create_ssl_context(
+        GatewayConfig(url="wss://other.example:18789/ws", allow_insecure_tls=True),
+    )
+
+    assert first is not None
+    assert first is second
@@ -45,3 +45,10 @@ def test_board_scoped_session_key_selects_non_lead() -> None:
     assert board_scoped_session_key(
         agent_id=agent_id, board_id=board_id, is_board_lead=False
     ) == board_agent_session_key(agent_id)
+
+
+def test_board_session_keys_are_memoized_per_id() -> None:
+    agent_id = UUID("00000000-0000-0000-0000-000000000003")
+    board_id = UUID("00000000-0000-0000-0000-000000000004")
+    assert board_agent_session_key(agent_id) is board_agent_session_key(agent_id)
+    assert board_lead_session_key(board_id) is board_lead_session_key(board_id)
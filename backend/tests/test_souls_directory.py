@@ -3,6 +3,9 @@
 
 from __future__ import annotations
 
+import pytest
+
+from app.services import souls_directory
 from app.services.souls_directory import SoulRef, _parse_sitemap_soul_refs, search_souls
 
 
@@ -31,3 +34,52 @@ def test_search_souls_matches_handle_or_slug() -> None:
     ]
     assert search_souls(refs, query="writer", limit=20) == [refs[1]]
     assert search_souls(refs, query="thedaviddias", limit=20) == [refs[0], refs[1]]
+
+
+@pytest.mark.asyncio
+async def test_fetch_soul_markdown_reuses_cached_content(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repeat fetches of the same soul should be served from the TTL cache."""
+    monkeypatch.setattr(souls_directory, "_markdown_cache", {})
+    requested: list[str] = []
+
+    class _Response:
+        text = "# SOUL.md - Code Reviewer"
+
+        def raise_for_status(self) -> None:
+            return None
+
+    class _Client:
+        async def get(self, url: str) -> _Response:
+            requested.append(url)
+            return _Response()
+
+    client = _Client()
+    first = await souls_directory.fetch_soul_markdown(
+        handle="thedaviddias",
+        slug="code-reviewer",
+        client=client,  # type: ignore[arg-type]
+    )
+    second = await souls_directory.fetch_soul_markdown(
+        handle="thedaviddias",
+        slug="code-reviewer.md",
+        client=client,  # type: ignore[arg-type]
+    )
+
+    assert first == second == "# SOUL.md - Code Reviewer"
+    assert requested == ["https://souls.directory/api/souls/thedaviddias/code-reviewer.md"]
+
+
+def test_store_markdown_prunes_expired_and_caps_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The markdown cache drops expired entries and evicts the oldest beyond its size cap."""
+    cache: dict[str, tuple[float, str]] = {}
+    monkeypatch.setattr(souls_directory, "_markdown_cache", cache)
+    monkeypatch.setattr(souls_directory, "_MARKDOWN_CACHE_MAX_ENTRIES", 2)
+    ttl = souls_directory._MARKDOWN_TTL_SECONDS
+
+    souls_directory._store_markdown("expired", "old", now=0.0)
+    souls_directory._store_markdown("a", "A", now=ttl + 1.0)
+    assert list(cache) == ["a"]
+
+    souls_directory._store_markdown("b", "B", now=ttl + 2.0)
+    souls_directory._store_markdown("c", "C", now=ttl + 3.0)
+    assert list(cache) == ["b", "c"]